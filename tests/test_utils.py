@@ -1,7 +1,9 @@
+import torch
 from torch.nn.modules.batchnorm import BatchNorm2d
 from torchvision.ops.misc import FrozenBatchNorm2d
 
 import timm
+from timm.utils.jit import export_frozen
 from timm.utils.model import freeze, unfreeze
 
 
@@ -54,4 +56,20 @@ def test_freeze_unfreeze():
     freeze(model.layer1[0], ['bn1'])
     assert isinstance(model.layer1[0].bn1, FrozenBatchNorm2d)    
     unfreeze(model.layer1[0], ['bn1'])
-    assert isinstance(model.layer1[0].bn1, BatchNorm2d)
\ No newline at end of file
+    assert isinstance(model.layer1[0].bn1, BatchNorm2d)
+
+
+def test_export_frozen(tmp_path):
+    model = timm.create_model('xception41', num_classes=10, drop_rate=0.2)
+    assert model.training
+    x = torch.randn(2, 3, 64, 64)
+    path = str(tmp_path / 'frozen.pt')
+    frozen = export_frozen(model, path)
+    # caller's model is left in its original mode
+    assert model.training
+
+    model.eval()
+    with torch.no_grad():
+        outputs = model(x)
+        assert torch.allclose(frozen(x), outputs, atol=1e-5)
+        assert torch.allclose(torch.jit.load(path)(x), outputs, atol=1e-5)
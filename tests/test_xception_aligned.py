@@ -0,0 +1,203 @@
+""" XceptionAligned specific tests (builder configs, inference / deployment helpers)
+"""
+import io
+
+import pytest
+import torch
+
+import timm
+from timm.models.layers import Conv2dSame
+from timm.models.xception_aligned import BlockCfg, XceptionAligned
+
+
+def _block_cfg(cfg_cls):
+    return [
+        cfg_cls(in_chs=64, out_chs=128, stride=2, pad_type='same'),
+        cfg_cls(in_chs=128, out_chs=128, stride=1),
+        cfg_cls(in_chs=128, out_chs=(128, 192, 256), stride=2, no_skip=True, start_with_relu=False),
+    ]
+
+
+@pytest.mark.parametrize('preact', [False, True])
+def test_xception_aligned_dict_block_cfg(preact):
+    torch.manual_seed(0)
+    model_dict = XceptionAligned(_block_cfg(dict), num_classes=10, preact=preact).eval()
+    torch.manual_seed(0)
+    model_cfg = XceptionAligned(_block_cfg(BlockCfg), num_classes=10, preact=preact).eval()
+    assert str(model_dict) == str(model_cfg)
+    assert model_dict.feature_info == model_cfg.feature_info
+    # pad_type is only set on the first block
+    assert any(isinstance(m, Conv2dSame) for m in model_cfg.blocks[0].modules())
+    assert not any(isinstance(m, Conv2dSame) for m in model_cfg.blocks[1].modules())
+    model_cfg.load_state_dict(model_dict.state_dict())
+    x = torch.randn(2, 3, 64, 64)
+    with torch.no_grad():
+        assert torch.equal(model_dict(x), model_cfg(x))
+
+
+def _create_model(model_name, **kwargs):
+    # small classifier, randomized BN stats so folding / layout changes aren't trivially exact
+    model = timm.create_model(model_name, num_classes=10, **kwargs).eval()
+    for m in model.modules():
+        if isinstance(m, torch.nn.BatchNorm2d):
+            m.running_mean.uniform_(-.5, .5)
+            m.running_var.uniform_(.5, 2.)
+            m.weight.data.uniform_(.5, 1.5)
+            m.bias.data.uniform_(-.5, .5)
+    return model
+
+
+@pytest.mark.parametrize('model_name', ['xception41', 'xception41p'])
+def test_xception_aligned_fuse(model_name):
+    model = _create_model(model_name)
+    x = torch.randn(2, 3, 64, 64)
+    with torch.no_grad():
+        outputs = model(x)
+        model.fuse()
+        fused_outputs = model(x)
+    if model_name == 'xception41':
+        # every BatchNorm is folded for the non pre-act model
+        assert not any(isinstance(m, torch.nn.BatchNorm2d) for m in model.modules())
+    assert torch.allclose(outputs, fused_outputs, atol=1e-5)
+
+
+@pytest.mark.parametrize('model_name', ['xception41', 'xception41p'])
+def test_xception_aligned_channels_last(model_name):
+    model = _create_model(model_name)
+    model_cl = _create_model(model_name, channels_last=True)
+    model_cl.load_state_dict(model.state_dict())
+    assert all(
+        p.is_contiguous(memory_format=torch.channels_last) for p in model_cl.parameters() if p.ndim == 4)
+
+    x = torch.randn(2, 3, 64, 64)
+    scripted = torch.jit.script(model_cl)
+    with torch.no_grad():
+        outputs = model(x)
+        assert torch.allclose(model_cl(x), outputs, atol=1e-5)
+        assert torch.allclose(scripted(x), outputs, atol=1e-5)
+
+
+@pytest.mark.parametrize('model_name', ['xception41', 'xception41p'])
+def test_xception_aligned_autotune_memory_format(model_name):
+    model = _create_model(model_name)
+    x = torch.randn(2, 3, 64, 64)
+    with torch.no_grad():
+        outputs = model(x)
+    chosen = model.autotune_memory_format(input_size=(3, 64, 64), batch_size=2, num_iter=1)
+    assert len(chosen) == len(model.blocks)
+    # only blocks at a format transition convert their input
+    prev = False
+    for block, use_channels_last in zip(model.blocks, chosen):
+        assert block.channels_last == (use_channels_last if use_channels_last != prev else None)
+        prev = use_channels_last
+
+    scripted = torch.jit.script(model)
+    with torch.no_grad():
+        assert torch.allclose(model(x), outputs, atol=1e-5)
+        assert torch.allclose(scripted(x), outputs, atol=1e-5)
+
+
+@pytest.mark.parametrize('model_name', ['xception41', 'xception41p'])
+def test_xception_aligned_inplace_residual(model_name):
+    model = _create_model(model_name)
+    x = torch.randn(2, 3, 64, 64)
+    # grad enabled uses the out-of-place residual add, no_grad accumulates in place
+    outputs = model(x)
+    with torch.no_grad():
+        assert torch.equal(model(x), outputs.detach())
+
+    # training step through the out-of-place path is unaffected
+    model.train()
+    model(x).sum().backward()
+    assert all(p.grad is not None for p in model.parameters() if p.requires_grad)
+
+
+def test_xception_aligned_quantize_for_trt_export():
+    pytest.importorskip('onnx')
+    model = timm.create_model('xception41', num_classes=10).eval()
+    model.fuse().quantize_for_trt()
+    x = torch.randn(2, 3, 64, 64)
+
+    # one QAT step
+    model.train()
+    model(x).sum().backward()
+
+    model.eval()
+    model.apply(torch.ao.quantization.disable_observer)
+    f = io.BytesIO()
+    torch.onnx.export(model, x, f, dynamo=False, opset_version=13)
+    onnx_model = f.getvalue()
+    assert b'QuantizeLinear' in onnx_model and b'DequantizeLinear' in onnx_model
+
+
+def test_xception_aligned_autocast():
+    model = _create_model('xception41')
+    model_autocast = _create_model('xception41', autocast=True)
+    model_autocast.load_state_dict(model.state_dict())
+    x = torch.randn(2, 3, 64, 64)
+    with torch.no_grad():
+        outputs = model(x)
+        autocast_outputs = model_autocast(x)
+    assert autocast_outputs.dtype == torch.float32
+    assert torch.allclose(autocast_outputs, outputs, atol=1e-2)
+
+
+def test_xception_aligned_cuda_graph_reset():
+    model = _create_model('xception41')
+    # stand-in for a captured graph, the methods that replace / re-layout params must drop it
+    for fn in (
+            lambda m: m.autotune_memory_format(input_size=(3, 64, 64), num_iter=1),
+            lambda m: m.reset_classifier(5),
+            lambda m: m.fuse(),
+            lambda m: m.quantize_for_trt()):
+        model._cuda_graph = object()
+        fn(model)
+        assert model._cuda_graph is None
+    with pytest.raises(AssertionError):
+        model.forward_graphed(torch.randn(1, 3, 64, 64))
+
+
+def test_xception_aligned_forward_graphed_input_mismatch():
+    model = _create_model('xception41')
+    # stand-in graph / static buffers, the input checks must fail before any replay
+    static_input = torch.zeros(8, 3, 64, 64)
+    model._cuda_graph = (object(), static_input, torch.zeros(8, 10))
+    for x in (torch.randn(1, 3, 64, 64), torch.randn(8, 3, 32, 32), torch.randn(8, 3, 64, 64).double()):
+        with pytest.raises(AssertionError, match='capture_cuda_graph'):
+            model.forward_graphed(x)
+    assert torch.equal(static_input, torch.zeros_like(static_input))
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='CUDA is required for graph capture')
+def test_xception_aligned_cuda_graph():
+    model = _create_model('xception41').cuda()
+    x = torch.randn(2, 3, 64, 64, device='cuda')
+    with torch.no_grad():
+        outputs = model(x)
+    model.capture_cuda_graph(x)
+    assert torch.allclose(model.forward_graphed(x), outputs, atol=1e-4)
+    # replay w/ new data of the same shape
+    x2 = torch.randn_like(x)
+    with torch.no_grad():
+        outputs2 = model(x2)
+    assert torch.allclose(model.forward_graphed(x2), outputs2, atol=1e-4)
+
+
+@pytest.mark.skipif(not hasattr(torch.nn.Module, 'compile'), reason='nn.Module.compile requires PyTorch >= 2.2')
+def test_xception_aligned_compile_blocks():
+    model = _create_model('xception41')
+    model_compiled = timm.create_model('xception41', num_classes=10, compile_blocks=True).eval()
+    # blocks are compiled in place, weight names must be unchanged
+    assert list(model_compiled.state_dict().keys()) == list(model.state_dict().keys())
+    model_compiled.load_state_dict(model.state_dict())
+    # only the 8 middle flow blocks are compiled
+    compiled = [i for i, b in enumerate(model_compiled.blocks) if getattr(b, '_compiled_call_impl', None) is not None]
+    assert compiled == list(range(3, 11))
+
+    x = torch.randn(2, 3, 64, 64)
+    with torch.no_grad():
+        assert torch.allclose(model_compiled(x), model(x), atol=1e-4)
+
+    # CUDA graph capture is refused for compiled models before any device checks
+    with pytest.raises(AssertionError, match='compile'):
+        model_compiled.capture_cuda_graph(x)
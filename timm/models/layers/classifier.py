@@ -3,7 +3,7 @@
 Hacked together by / Copyright 2020 Ross Wightman
 """
 from torch import nn as nn
-from torch.nn import functional as F
+from torch.jit import Final
 
 from .adaptive_avgmax_pool import SelectAdaptivePool2d
 
@@ -37,18 +37,19 @@ def create_classifier(num_features, num_classes, pool_type='avg', use_conv=False
 
 class ClassifierHead(nn.Module):
     """Classifier head w/ configurable global pooling and dropout."""
+    drop_rate: Final[float]
 
     def __init__(self, in_chs, num_classes, pool_type='avg', drop_rate=0., use_conv=False):
         super(ClassifierHead, self).__init__()
         self.drop_rate = drop_rate
         self.global_pool, num_pooled_features = _create_pool(in_chs, num_classes, pool_type, use_conv=use_conv)
+        self.drop = nn.Dropout(float(drop_rate)) if drop_rate else nn.Identity()
         self.fc = _create_fc(num_pooled_features, num_classes, use_conv=use_conv)
         self.flatten = nn.Flatten(1) if use_conv and pool_type else nn.Identity()
 
     def forward(self, x, pre_logits: bool = False):
         x = self.global_pool(x)
-        if self.drop_rate:
-            x = F.dropout(x, p=float(self.drop_rate), training=self.training)
+        x = self.drop(x)
         if pre_logits:
             return x.flatten(1)
         else:
@@ -5,10 +5,15 @@ https://github.com/tensorflow/models/blob/master/research/deeplab/g3doc/model_zo
 
 Hacked together by / Copyright 2020 Ross Wightman
 """
+import time
+from dataclasses import dataclass, replace
 from functools import partial
+from typing import Optional, Tuple, Union
 
 import torch
 import torch.nn as nn
+from torch.jit import Final
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 
 from timm.data import IMAGENET_INCEPTION_MEAN, IMAGENET_INCEPTION_STD
 from .helpers import build_model_with_cfg, checkpoint_seq
@@ -51,6 +56,17 @@ default_cfgs = dict(
 )
 
 
+@dataclass
+class BlockCfg:
+    in_chs: int
+    out_chs: Union[int, Tuple[int, int, int]]  # per separable conv if tuple
+    stride: int = 1
+    dilation: int = 1
+    no_skip: bool = False
+    start_with_relu: bool = True  # ignored by pre-act blocks
+    pad_type: str = ''
+
+
 class SeparableConv2d(nn.Module):
     def __init__(
             self, in_chs, out_chs, kernel_size=3, stride=1, dilation=1, padding='',
@@ -64,20 +80,33 @@ class SeparableConv2d(nn.Module):
             in_chs, in_chs, kernel_size, stride=stride,
             padding=padding, dilation=dilation, depthwise=True)
         self.bn_dw = norm_layer(in_chs)
-        self.act_dw = act_layer(inplace=True) if act_layer is not None else nn.Identity()
+        self.act_dw = act_layer(inplace=True) if act_layer is not None else None
 
         # pointwise convolution
         self.conv_pw = create_conv2d(in_chs, out_chs, kernel_size=1)
         self.bn_pw = norm_layer(out_chs)
-        self.act_pw = act_layer(inplace=True) if act_layer is not None else nn.Identity()
+        self.act_pw = act_layer(inplace=True) if act_layer is not None else None
+
+    @torch.no_grad()
+    def fuse(self):
+        """ Fold eval mode BatchNorm into the depthwise and pointwise convs.
+        """
+        if isinstance(self.bn_dw, nn.BatchNorm2d):
+            self.conv_dw = fuse_conv_bn_eval(self.conv_dw, self.bn_dw)
+            self.bn_dw = nn.Identity()
+        if isinstance(self.bn_pw, nn.BatchNorm2d):
+            self.conv_pw = fuse_conv_bn_eval(self.conv_pw, self.bn_pw)
+            self.bn_pw = nn.Identity()
 
     def forward(self, x):
         x = self.conv_dw(x)
         x = self.bn_dw(x)
-        x = self.act_dw(x)
+        if self.act_dw is not None:
+            x = self.act_dw(x)
         x = self.conv_pw(x)
         x = self.bn_pw(x)
-        x = self.act_pw(x)
+        if self.act_pw is not None:
+            x = self.act_pw(x)
         return x
 
 
@@ -107,6 +136,8 @@ class PreSeparableConv2d(nn.Module):
 
 
 class XceptionModule(nn.Module):
+    channels_last: Optional[bool]
+
     def __init__(
             self, in_chs, out_chs, stride=1, dilation=1, pad_type='',
             start_with_relu=True, no_skip=False, act_layer=nn.ReLU, norm_layer=None):
@@ -115,6 +146,7 @@ class XceptionModule(nn.Module):
         self.in_channels = in_chs
         self.out_channels = out_chs[-1]
         self.no_skip = no_skip
+        self.channels_last = None  # memory format override, set by XceptionAligned.autotune_memory_format()
         if not no_skip and (self.out_channels != self.in_channels or stride != 1):
             self.shortcut = ConvNormAct(
                 in_chs, self.out_channels, 1, stride=stride, norm_layer=norm_layer, apply_act=False)
@@ -132,16 +164,25 @@ class XceptionModule(nn.Module):
             in_chs = out_chs[i]
 
     def forward(self, x):
+        channels_last = self.channels_last
+        if channels_last is not None:
+            x = x.contiguous(memory_format=torch.channels_last if channels_last else torch.contiguous_format)
         skip = x
         x = self.stack(x)
         if self.shortcut is not None:
             skip = self.shortcut(skip)
         if not self.no_skip:
-            x = x + skip
+            if torch.is_grad_enabled():
+                x = x + skip
+            else:
+                # x is a fresh output of the stack, safe to accumulate into when autograd isn't recording
+                x = x.add_(skip)
         return x
 
 
 class PreXceptionModule(nn.Module):
+    channels_last: Optional[bool]
+
     def __init__(
             self, in_chs, out_chs, stride=1, dilation=1, pad_type='',
             no_skip=False, act_layer=nn.ReLU, norm_layer=None):
@@ -150,6 +191,7 @@ class PreXceptionModule(nn.Module):
         self.in_channels = in_chs
         self.out_channels = out_chs[-1]
         self.no_skip = no_skip
+        self.channels_last = None  # memory format override, set by XceptionAligned.autotune_memory_format()
         if not no_skip and (self.out_channels != self.in_channels or stride != 1):
             self.shortcut = create_conv2d(in_chs, self.out_channels, 1, stride=stride)
         else:
@@ -164,26 +206,51 @@ class PreXceptionModule(nn.Module):
             in_chs = out_chs[i]
 
     def forward(self, x):
+        channels_last = self.channels_last
+        if channels_last is not None:
+            x = x.contiguous(memory_format=torch.channels_last if channels_last else torch.contiguous_format)
         x = self.norm(x)
         skip = x
         x = self.stack(x)
         if not self.no_skip:
-            x = x + self.shortcut(skip)
+            if torch.is_grad_enabled():
+                x = x + self.shortcut(skip)
+            else:
+                x = x.add_(self.shortcut(skip))
         return x
 
 
 class XceptionAligned(nn.Module):
     """Modified Aligned Xception
+
+    If `channels_last` is set, the weights are stored in channels_last (NHWC) memory format and the input
+    is converted once at entry so that every conv / norm / residual add stays on the NHWC kernel path.
+    NOTE features_only models bypass `forward_features()`, they get channels_last weights but no input
+    conversion, pass channels_last input to those.
+
+    If `compile_blocks` is set (PyTorch 2.x), the middle flow blocks (identical, stride 1, static shape) are
+    compiled in place w/ torch.compile. Entry / exit flow blocks stay eager to avoid a recompile per shape.
+
+    If `autocast` is set, forward runs under bfloat16 autocast on the input's device (norm / reductions
+    stay in float32 per autocast op lists), halving activation memory traffic. Best combined w/ `channels_last`.
+    Logits are cast back to float32. NOTE only `forward()` honours the flag, `forward_features()`,
+    `forward_head()` and features_only models run in the input dtype. Autocast is also skipped when scripted,
+    wrap calls to those in torch.autocast instead.
     """
+    drop_rate: Final[float]
 
     def __init__(
             self, block_cfg, num_classes=1000, in_chans=3, output_stride=32, preact=False,
-            act_layer=nn.ReLU, norm_layer=nn.BatchNorm2d, drop_rate=0., global_pool='avg'):
+            act_layer=nn.ReLU, norm_layer=nn.BatchNorm2d, drop_rate=0., global_pool='avg',
+            channels_last=False, compile_blocks=False, autocast=False):
         super(XceptionAligned, self).__init__()
         assert output_stride in (8, 16, 32)
         self.num_classes = num_classes
         self.drop_rate = drop_rate
+        self.channels_last = channels_last
+        self.autocast = autocast
         self.grad_checkpointing = False
+        self._cuda_graph = None  # (graph, static input, static output), set by capture_cuda_graph()
 
         layer_args = dict(act_layer=act_layer, norm_layer=norm_layer)
         self.stem = nn.Sequential(*[
@@ -196,26 +263,45 @@ class XceptionAligned(nn.Module):
         curr_stride = 2
         self.feature_info = []
         self.blocks = nn.Sequential()
-        module_fn = PreXceptionModule if preact else XceptionModule
+        middle_idx = []
         for i, b in enumerate(block_cfg):
-            b['dilation'] = curr_dilation
-            if b['stride'] > 1:
+            if isinstance(b, dict):
+                b = BlockCfg(**b)
+            b = replace(b, dilation=curr_dilation)
+            if b.stride > 1:
                 name = f'blocks.{i}.stack.conv2' if preact else f'blocks.{i}.stack.act3'
-                self.feature_info += [dict(num_chs=to_3tuple(b['out_chs'])[-2], reduction=curr_stride, module=name)]
-                next_stride = curr_stride * b['stride']
+                self.feature_info += [dict(num_chs=to_3tuple(b.out_chs)[-2], reduction=curr_stride, module=name)]
+                next_stride = curr_stride * b.stride
                 if next_stride > output_stride:
-                    curr_dilation *= b['stride']
-                    b['stride'] = 1
+                    curr_dilation *= b.stride
+                    b = replace(b, stride=1)
                 else:
                     curr_stride = next_stride
-            self.blocks.add_module(str(i), module_fn(**b, **layer_args))
+            if preact:
+                block = PreXceptionModule(
+                    b.in_chs, b.out_chs, stride=b.stride, dilation=b.dilation, pad_type=b.pad_type,
+                    no_skip=b.no_skip, act_layer=act_layer, norm_layer=norm_layer)
+            else:
+                block = XceptionModule(
+                    b.in_chs, b.out_chs, stride=b.stride, dilation=b.dilation, pad_type=b.pad_type,
+                    start_with_relu=b.start_with_relu, no_skip=b.no_skip, act_layer=act_layer, norm_layer=norm_layer)
+            self.blocks.add_module(str(i), block)
             self.num_features = self.blocks[-1].out_channels
+            if b.stride == 1 and self.blocks[-1].in_channels == self.num_features and not b.no_skip:
+                middle_idx.append(i)
 
         self.feature_info += [dict(
             num_chs=self.num_features, reduction=curr_stride, module='blocks.' + str(len(self.blocks) - 1))]
         self.act = act_layer(inplace=True) if preact else nn.Identity()
         self.head = ClassifierHead(
             in_chs=self.num_features, num_classes=num_classes, pool_type=global_pool, drop_rate=drop_rate)
+        if channels_last:
+            self.to(memory_format=torch.channels_last)
+        if compile_blocks:
+            assert hasattr(nn.Module, 'compile'), 'compile_blocks requires PyTorch >= 2.2'
+            # compiled in place so module structure and state_dict keys are unchanged
+            for i in middle_idx:
+                self.blocks[i].compile(mode='reduce-overhead', fullgraph=True)
 
     @torch.jit.ignore
     def group_matcher(self, coarse=False):
@@ -233,9 +319,162 @@ class XceptionAligned(nn.Module):
         return self.head.fc
 
     def reset_classifier(self, num_classes, global_pool='avg'):
+        self._cuda_graph = None  # head is replaced, a captured graph would replay the old one
         self.head = ClassifierHead(self.num_features, num_classes, pool_type=global_pool, drop_rate=self.drop_rate)
 
+    @torch.no_grad()
+    def fuse(self):
+        """ Fold BatchNorm into the preceding conv of each SeparableConv2d / ConvNormAct for inference.
+
+        Only valid in eval mode, the model cannot be trained afterwards. Pre-activation variants
+        (norm before conv) are left untouched.
+        """
+        assert not self.training, 'BatchNorm can only be fused in eval mode'
+        self._cuda_graph = None  # convs are replaced, a captured graph would replay stale params
+        for m in self.modules():
+            if isinstance(m, SeparableConv2d):
+                m.fuse()
+            elif isinstance(m, ConvNormAct) and isinstance(m.bn, nn.BatchNorm2d):
+                # NOTE BatchNormAct2d drop is a no-op in eval, only the activation needs to be kept
+                act = m.bn.act if hasattr(m.bn, 'act') else nn.Identity()
+                m.conv = fuse_conv_bn_eval(m.conv, m.bn)
+                m.bn = act
+        return self
+
+    @torch.jit.ignore
+    def quantize_for_trt(self):
+        """ Prepare the SeparableConv2d blocks for INT8 quantization aware training / calibration.
+
+        Each SeparableConv2d is wrapped in a QuantWrapper (fake-quantized input) and its convs swapped for QAT
+        convs w/ symmetric per-channel INT8 weight fake-quant. Stem, shortcuts, residual adds and head stay in
+        float. Call fuse() first so BatchNorm does not sit between the depthwise and pointwise convs.
+
+        Export: after calibration / fine-tuning, freeze the quantization ranges with
+        `model.apply(torch.ao.quantization.disable_observer)` and switch to eval mode. The observer updates
+        (aten::copy) cannot be exported, with them disabled torch.onnx.export (TorchScript exporter, opset >= 13)
+        emits QuantizeLinear / DequantizeLinear pairs around each separable conv, the pattern TensorRT maps to
+        its fused INT8 depthwise-separable kernels (sm72+).
+        """
+        from torch.ao.quantization import (
+            FakeQuantize, MovingAverageMinMaxObserver, QConfig, QuantWrapper, default_per_channel_weight_fake_quant,
+            prepare_qat)
+        self._cuda_graph = None  # modules / params are replaced, a captured graph would be stale
+        # TensorRT only supports symmetric INT8 quantization
+        qconfig = QConfig(
+            activation=FakeQuantize.with_args(
+                observer=MovingAverageMinMaxObserver, quant_min=-128, quant_max=127,
+                dtype=torch.qint8, qscheme=torch.per_tensor_symmetric),
+            weight=default_per_channel_weight_fake_quant,
+        )
+        for module in list(self.modules()):
+            for name, child in module.named_children():
+                if isinstance(child, SeparableConv2d):
+                    child.qconfig = qconfig
+                    setattr(module, name, QuantWrapper(child))
+        was_training = self.training
+        prepare_qat(self.train(), inplace=True)
+        self.train(was_training)
+        return self
+
+    @torch.jit.ignore
+    @torch.no_grad()
+    def autotune_memory_format(self, input_size=(3, 299, 299), batch_size=1, num_iter=10):
+        """ Pick the faster memory format (NCHW or NHWC) for each block at the given input size.
+
+        Each block is timed in eval mode on the current device w/ weights and input in both formats, the
+        winner is kept (weights converted). Conv / norm / residual add outputs follow their input format, so
+        only blocks at a format transition convert their input on entry, avoiding redundant copies. Call after
+        moving the model to its deployment device / dtype. Returns the chosen formats, True for channels_last.
+        """
+        self._cuda_graph = None  # block weights are re-laid out, a captured graph would be stale
+        was_training = self.training
+        self.eval()
+        param = next(self.parameters())
+        x = torch.randn((batch_size,) + tuple(input_size), device=param.device, dtype=param.dtype)
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
+        x = self.stem(x)
+
+        def _time(fn, inp):
+            fn(inp)  # warmup
+            if inp.is_cuda:
+                torch.cuda.synchronize(inp.device)
+            start = time.perf_counter()
+            for _ in range(num_iter):
+                fn(inp)
+            if inp.is_cuda:
+                torch.cuda.synchronize(inp.device)
+            return time.perf_counter() - start
+
+        chosen = []
+        prev_channels_last = x.is_contiguous(memory_format=torch.channels_last)
+        for block in self.blocks:
+            block.channels_last = None
+            timings = []
+            for memory_format in (torch.contiguous_format, torch.channels_last):
+                block.to(memory_format=memory_format)
+                timings.append(_time(block, x.contiguous(memory_format=memory_format)))
+            use_channels_last = timings[1] < timings[0]
+            block.to(memory_format=torch.channels_last if use_channels_last else torch.contiguous_format)
+            # only convert at transitions, the residual add sees matching strides as skip is taken post conversion
+            block.channels_last = use_channels_last if use_channels_last != prev_channels_last else None
+            prev_channels_last = use_channels_last
+            chosen.append(use_channels_last)
+            x = block(x.contiguous(
+                memory_format=torch.channels_last if use_channels_last else torch.contiguous_format))
+        self.train(was_training)
+        return chosen
+
+    @torch.jit.ignore
+    @torch.no_grad()
+    def capture_cuda_graph(self, example_input, num_warmup=3):
+        """ Capture an inference forward pass in a CUDA graph for fixed shape replay w/ forward_graphed().
+
+        The model should already be on the GPU, in eval mode and in its final form (fused, memory format,
+        autocast), the example input defines the batch size, shape, dtype and strides that will be replayed.
+        Not supported w/ compile_blocks, reduce-overhead mode manages its own CUDA graphs.
+
+        The graph replays against the parameter memory seen at capture. fuse(), autotune_memory_format(),
+        quantize_for_trt() and reset_classifier() discard it, but after `.to()` / `.cuda()` / loading weights by
+        assigning new tensors the graph must be recaptured, forward_graphed() can't detect this.
+        """
+        assert not any(getattr(m, '_compiled_call_impl', None) is not None for m in self.modules()), \
+            'CUDA graph capture is not supported w/ compiled blocks (compile_blocks=True)'
+        assert example_input.is_cuda, 'CUDA graph capture requires a CUDA input'
+        assert not self.training, 'CUDA graph capture is only supported for inference (eval mode)'
+        self._cuda_graph = None
+        static_input = example_input.clone()
+        # warmup on a side stream so lazy init / autotuning happens outside of the capture
+        stream = torch.cuda.Stream(device=static_input.device)
+        stream.wait_stream(torch.cuda.current_stream(static_input.device))
+        with torch.cuda.stream(stream):
+            for _ in range(num_warmup):
+                self(static_input)
+        torch.cuda.current_stream(static_input.device).wait_stream(stream)
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            static_output = self(static_input)
+        self._cuda_graph = (graph, static_input, static_output)
+        return self
+
+    @torch.jit.ignore
+    def forward_graphed(self, x):
+        """ Replay the graph captured by capture_cuda_graph() for an input of the captured shape.
+        """
+        assert self._cuda_graph is not None, 'capture_cuda_graph() must be called first'
+        graph, static_input, static_output = self._cuda_graph
+        # copy_ would silently broadcast / cast, a replay is only valid for the exact captured input
+        assert x.shape == static_input.shape and x.dtype == static_input.dtype and x.device == static_input.device, \
+            f'Input ({tuple(x.shape)}, {x.dtype}, {x.device}) does not match the captured input ' \
+            f'({tuple(static_input.shape)}, {static_input.dtype}, {static_input.device}), ' \
+            f'call capture_cuda_graph() again w/ this input.'
+        static_input.copy_(x)
+        graph.replay()
+        return static_output.clone()
+
     def forward_features(self, x):
+        if self.channels_last:
+            x = x.contiguous(memory_format=torch.channels_last)
         x = self.stem(x)
         if self.grad_checkpointing and not torch.jit.is_scripting():
             x = checkpoint_seq(self.blocks, x)
@@ -248,6 +487,11 @@ class XceptionAligned(nn.Module):
         return self.head(x, pre_logits=pre_logits)
 
     def forward(self, x):
+        if self.autocast and not torch.jit.is_scripting():
+            with torch.autocast(device_type=x.device.type, dtype=torch.bfloat16):
+                x = self.forward_features(x)
+                x = self.forward_head(x)
+            return x.float()
         x = self.forward_features(x)
         x = self.forward_head(x)
         return x
@@ -266,14 +510,14 @@ def xception41(pretrained=False, **kwargs):
     """
     block_cfg = [
         # entry flow
-        dict(in_chs=64, out_chs=128, stride=2),
-        dict(in_chs=128, out_chs=256, stride=2),
-        dict(in_chs=256, out_chs=728, stride=2),
+        BlockCfg(in_chs=64, out_chs=128, stride=2),
+        BlockCfg(in_chs=128, out_chs=256, stride=2),
+        BlockCfg(in_chs=256, out_chs=728, stride=2),
         # middle flow
-        *([dict(in_chs=728, out_chs=728, stride=1)] * 8),
+        *([BlockCfg(in_chs=728, out_chs=728, stride=1)] * 8),
         # exit flow
-        dict(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
-        dict(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True, start_with_relu=False),
+        BlockCfg(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
+        BlockCfg(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True, start_with_relu=False),
     ]
     model_args = dict(block_cfg=block_cfg, norm_layer=partial(nn.BatchNorm2d, eps=.001, momentum=.1), **kwargs)
     return _xception('xception41', pretrained=pretrained, **model_args)
@@ -285,14 +529,14 @@ def xception65(pretrained=False, **kwargs):
     """
     block_cfg = [
         # entry flow
-        dict(in_chs=64, out_chs=128, stride=2),
-        dict(in_chs=128, out_chs=256, stride=2),
-        dict(in_chs=256, out_chs=728, stride=2),
+        BlockCfg(in_chs=64, out_chs=128, stride=2),
+        BlockCfg(in_chs=128, out_chs=256, stride=2),
+        BlockCfg(in_chs=256, out_chs=728, stride=2),
         # middle flow
-        *([dict(in_chs=728, out_chs=728, stride=1)] * 16),
+        *([BlockCfg(in_chs=728, out_chs=728, stride=1)] * 16),
         # exit flow
-        dict(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
-        dict(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True, start_with_relu=False),
+        BlockCfg(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
+        BlockCfg(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True, start_with_relu=False),
     ]
     model_args = dict(block_cfg=block_cfg, norm_layer=partial(nn.BatchNorm2d, eps=.001, momentum=.1), **kwargs)
     return _xception('xception65', pretrained=pretrained, **model_args)
@@ -304,16 +548,16 @@ def xception71(pretrained=False, **kwargs):
     """
     block_cfg = [
         # entry flow
-        dict(in_chs=64, out_chs=128, stride=2),
-        dict(in_chs=128, out_chs=256, stride=1),
-        dict(in_chs=256, out_chs=256, stride=2),
-        dict(in_chs=256, out_chs=728, stride=1),
-        dict(in_chs=728, out_chs=728, stride=2),
+        BlockCfg(in_chs=64, out_chs=128, stride=2),
+        BlockCfg(in_chs=128, out_chs=256, stride=1),
+        BlockCfg(in_chs=256, out_chs=256, stride=2),
+        BlockCfg(in_chs=256, out_chs=728, stride=1),
+        BlockCfg(in_chs=728, out_chs=728, stride=2),
         # middle flow
-        *([dict(in_chs=728, out_chs=728, stride=1)] * 16),
+        *([BlockCfg(in_chs=728, out_chs=728, stride=1)] * 16),
         # exit flow
-        dict(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
-        dict(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True, start_with_relu=False),
+        BlockCfg(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
+        BlockCfg(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True, start_with_relu=False),
     ]
     model_args = dict(block_cfg=block_cfg, norm_layer=partial(nn.BatchNorm2d, eps=.001, momentum=.1), **kwargs)
     return _xception('xception71', pretrained=pretrained, **model_args)
@@ -325,14 +569,14 @@ def xception41p(pretrained=False, **kwargs):
     """
     block_cfg = [
         # entry flow
-        dict(in_chs=64, out_chs=128, stride=2),
-        dict(in_chs=128, out_chs=256, stride=2),
-        dict(in_chs=256, out_chs=728, stride=2),
+        BlockCfg(in_chs=64, out_chs=128, stride=2),
+        BlockCfg(in_chs=128, out_chs=256, stride=2),
+        BlockCfg(in_chs=256, out_chs=728, stride=2),
         # middle flow
-        *([dict(in_chs=728, out_chs=728, stride=1)] * 8),
+        *([BlockCfg(in_chs=728, out_chs=728, stride=1)] * 8),
         # exit flow
-        dict(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
-        dict(in_chs=1024, out_chs=(1536, 1536, 2048), no_skip=True, stride=1),
+        BlockCfg(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
+        BlockCfg(in_chs=1024, out_chs=(1536, 1536, 2048), no_skip=True, stride=1),
     ]
     model_args = dict(block_cfg=block_cfg, preact=True, norm_layer=nn.BatchNorm2d, **kwargs)
     return _xception('xception41p', pretrained=pretrained, **model_args)
@@ -344,14 +588,14 @@ def xception65p(pretrained=False, **kwargs):
     """
     block_cfg = [
         # entry flow
-        dict(in_chs=64, out_chs=128, stride=2),
-        dict(in_chs=128, out_chs=256, stride=2),
-        dict(in_chs=256, out_chs=728, stride=2),
+        BlockCfg(in_chs=64, out_chs=128, stride=2),
+        BlockCfg(in_chs=128, out_chs=256, stride=2),
+        BlockCfg(in_chs=256, out_chs=728, stride=2),
         # middle flow
-        *([dict(in_chs=728, out_chs=728, stride=1)] * 16),
+        *([BlockCfg(in_chs=728, out_chs=728, stride=1)] * 16),
         # exit flow
-        dict(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
-        dict(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True),
+        BlockCfg(in_chs=728, out_chs=(728, 1024, 1024), stride=2),
+        BlockCfg(in_chs=1024, out_chs=(1536, 1536, 2048), stride=1, no_skip=True),
     ]
     model_args = dict(
         block_cfg=block_cfg, preact=True, norm_layer=partial(nn.BatchNorm2d, eps=.001, momentum=.1), **kwargs)
@@ -2,10 +2,13 @@
 
 Hacked together by / Copyright 2020 Ross Wightman
 """
+import logging
 import os
 
 import torch
 
+_logger = logging.getLogger(__name__)
+
 
 def set_jit_legacy():
     """ Set JIT executor to legacy w/ support for op fusion
@@ -20,6 +23,31 @@ def set_jit_legacy():
     #torch._C._jit_set_texpr_fuser_enabled(True)
 
 
+def export_frozen(model, path=None):
+    """ Script and freeze a model for inference, optionally saving it to `path`.
+
+    Freezing inlines parameters / attributes as constants, folding eval BatchNorm and removing
+    dropout / training branches. The model is scripted in eval mode, its original train / eval mode is
+    restored afterwards. The saved module is the portable frozen one, the returned module is additionally
+    passed through `torch.jit.optimize_for_inference` (not serializable, host specific).
+    NOTE the first few calls are slow as the JIT profiles and compiles shape specialized kernels,
+    warm it up at the deployment input size.
+    """
+    was_training = model.training
+    model.eval()
+    try:
+        frozen = torch.jit.freeze(torch.jit.script(model))
+    finally:
+        model.train(was_training)
+    if path:
+        frozen.save(path)
+    try:
+        frozen = torch.jit.optimize_for_inference(frozen)
+    except Exception as e:
+        _logger.warning(f'torch.jit.optimize_for_inference failed ({e}), using frozen model as is.')
+    return frozen
+
+
 def set_jit_fuser(fuser):
     if fuser == "te":
         # default fuser should be == 'te'